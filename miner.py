@@ -1,30 +1,56 @@
 import os
 import time
+import asyncio
 import argparse
 import traceback
 import bittensor as bt
 import subprocess
 import json
 import shlex
-from typing import Tuple, Optional, Dict, List
+import shutil
+import codecs
+import re
+from typing import Tuple, Optional, Union, Sequence
 import pexpect
 
-from protocol import RadicleSubnetSynapse
+from protocol import RadicleSubnetSynapse, RadicleOperation
+
+# Prompt printed by `rad node start` before unlocking the identity; compiled once instead of on every (re)start.
+# The node child runs in bytes mode, so the pattern is bytes too.
+_PASSPHRASE_PROMPT_RE = re.compile(rb"Passphrase:")
+
+# `rad sync` success markers, matched in one pass over the output; the check mark lines are case-sensitive as rad prints them
+_SYNC_OK_RE = re.compile(r"✓ Synced|(?i:up to date|nothing to sync)")
+# Issue and patch syncs also accept the fetch confirmation
+_SYNC_OR_FETCH_OK_RE = re.compile(r"✓ Synced|✓ Project data fetched|(?i:up to date|nothing to sync)")
+
+# A `rad ls --seeded` line holding an RID: optional indentation, then "rad:" and at least 7 more characters
+# (the stripped line is longer than 10 characters)
+_SEEDED_RID_LINE_RE = re.compile(r"^[^\S\n]*rad:.{6,}\S", re.MULTILINE)
+
+# Pre-split argv for the fixed commands issued per request, so they skip shlex tokenizing on every call
+_ARGV_RAD_NODE_STATUS = ("rad", "node", "status")
+_ARGV_RAD_LS_SEEDED = ("rad", "ls", "--seeded")
+_ARGV_RAD_PATH = ("rad", "path")
+_ARGV_RAD_SELF_ALIAS = ("rad", "self", "--alias")
+_ARGV_RAD_SELF_NID = ("rad", "self", "--nid")
 
 # Helper function to run shell commands
-def run_command(command: str, suppress_error: bool = False, cwd: Optional[str] = None) -> Tuple[bool, str, str]:
-    """Executes a shell command and returns success, stdout, and stderr."""
+def run_command(command: Union[str, Sequence[str]], suppress_error: bool = False, cwd: Optional[str] = None) -> Tuple[bool, str, str]:
+    """Executes a command (a string to be shlex-split, or an already split argv) and returns success, stdout, and stderr."""
     try:
         bt.logging.debug(f"Running command: {command}")
-        process = subprocess.Popen(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd)
-        stdout, stderr = process.communicate(timeout=60) # 60 second timeout
-        success = process.returncode == 0
+        argv = shlex.split(command) if isinstance(command, str) else list(command)
+        completed = subprocess.run(argv, capture_output=True, timeout=60, cwd=cwd) # 60 second timeout
+        # Decode once as UTF-8 regardless of locale; rad prints non-ASCII markers such as '✓'
+        stdout, stderr = completed.stdout.decode('utf-8', 'replace').strip(), completed.stderr.decode('utf-8', 'replace').strip()
+        success = completed.returncode == 0
         if not success and not suppress_error:
-            bt.logging.error(f"Command failed: {command}\nStderr: {stderr.strip()}\nStdout: {stdout.strip()}")
-        return success, stdout.strip(), stderr.strip()
+            bt.logging.error(f"Command failed: {command}\nStderr: {stderr}\nStdout: {stdout}")
+        return success, stdout, stderr
     except subprocess.TimeoutExpired:
+        # subprocess.run has already killed and reaped the child
         bt.logging.error(f"Command timed out: {command}")
-        process.kill()
         return False, "", "Timeout expired"
     except Exception as e:
         bt.logging.error(f"Error running command {command}: {e}")
@@ -35,9 +61,24 @@ class Miner:
         self.config = self.get_config()
         self.setup_logging()
         self.radicle_node_process = None
+        # Node output is read in raw chunks; the decoder and the unfinished last line carry over between reads
+        self._node_output_decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._node_output_tail = ""
+        self._status_cache = (None, 0.0) # (run_command result for `rad node status`, monotonic timestamp)
         self.setup_radicle_dependencies() # Check/install Radicle
         self.ensure_radicle_auth_and_config() # Ensure miner identity and config
+        self._load_radicle_identity() # `rad path` and alias/NID are fixed for the life of the process
         self.setup_bittensor_objects()
+        # operation_type -> handler, so each request is dispatched with one dict lookup
+        self._operation_handlers = {
+            RadicleOperation.VALIDATE_PUSH.value: self._handle_validate_push,
+            RadicleOperation.GET_MINER_STATUS.value: self._handle_get_miner_status,
+            RadicleOperation.VALIDATE_CHANGES_SYNC.value: self._handle_changes_sync,
+            RadicleOperation.VALIDATE_BRANCH_SYNC.value: self._handle_branch_sync,
+            RadicleOperation.VALIDATE_ISSUE_SYNC.value: self._handle_issue_sync,
+            RadicleOperation.VALIDATE_PATCH_SYNC.value: self._handle_patch_sync,
+            RadicleOperation.UNSEED_REPO.value: self._handle_unseed_repo,
+        }
         self.start_radicle_node() # Start Radicle seed node
 
     def get_config(self):
@@ -74,6 +115,8 @@ class Miner:
 
     def setup_logging(self):
         bt.logging(config=self.config, logging_dir=self.config.full_path)
+        # Per-request trace messages are only formatted when bittensor was configured with --logging.trace
+        self.trace_enabled = bool(self.config.logging.trace)
         bt.logging.info(f"Running miner for subnet: {self.config.netuid} on network: {self.config.subtensor.network} with config:")
         bt.logging.info(self.config)
 
@@ -136,10 +179,46 @@ class Miner:
             bt.logging.info(f"Radicle config found at {config_path}.")
             # Optionally, verify and update existing config here if needed
 
+    def _load_radicle_identity(self):
+        """Resolves the Radicle home (`rad path`) and this node's alias and NID and keeps them on self."""
+        path_ok, path_out, _ = run_command(_ARGV_RAD_PATH, suppress_error=True)
+        alias_ok, alias_out, _ = run_command(_ARGV_RAD_SELF_ALIAS, suppress_error=True)
+        nid_ok, nid_out, _ = run_command(_ARGV_RAD_SELF_NID, suppress_error=True)
+        self._rad_path = path_out if path_ok and path_out else None
+        self._rad_alias = alias_out if alias_ok and alias_out else None
+        self._rad_nid = nid_out if nid_ok and nid_out else None
+        self._identity_checked_at = time.monotonic()
+
+    def _retry_radicle_identity(self, ttl: float = 30):
+        """Re-resolves an alias/NID that could not be loaded, at most once every `ttl` seconds."""
+        if self._rad_alias is not None and self._rad_nid is not None:
+            return
+        if time.monotonic() - self._identity_checked_at >= ttl:
+            self._load_radicle_identity()
+
+    def _get_rad_path(self) -> str:
+        """Cached `rad path`; re-queried only if it could not be resolved at startup."""
+        if self._rad_path is None:
+            success, stdout, _ = run_command(_ARGV_RAD_PATH)
+            if not success or not stdout:
+                return stdout
+            self._rad_path = stdout
+        return self._rad_path
+
+    def _cached_rad_status(self, ttl: float = 30) -> Tuple[bool, str, str]:
+        """Returns the result of `rad node status`, re-running the command at most once every `ttl` seconds."""
+        result, ts = self._status_cache
+        if result is not None and time.monotonic() - ts < ttl:
+            return result
+        result = run_command(_ARGV_RAD_NODE_STATUS, suppress_error=True)
+        self._status_cache = (result, time.monotonic())
+        return result
+
     def start_radicle_node(self):
         bt.logging.info("Attempting to start Radicle seed node...")
         # Check if already running (simple check, could be more robust)
-        _, stdout, _ = run_command("rad node status", suppress_error=True)
+        self._status_cache = (None, 0.0) # Always probe fresh here, this also runs on restarts
+        _, stdout, _ = self._cached_rad_status()
         if "running" in stdout.lower() and "offline" not in stdout.lower() :
              bt.logging.info("Radicle node appears to be already running.")
              # Consider how to manage this if it was started outside this script
@@ -148,11 +227,13 @@ class Miner:
         try:
             # Using Popen for non-blocking start. For production, systemd is better.
             command = "rad node start"
-            child = pexpect.spawn(command, encoding="utf-8")
-            child.expect("Passphrase:")
+            # No encoding: pexpect hands back raw bytes and the drain task decodes whole chunks once
+            child = pexpect.spawn(command)
+            child.expect(_PASSPHRASE_PROMPT_RE)
             child.sendline("<your_radicle_passphrase>")  # Replace with your actual passphrase or handle securely
             bt.logging.info("Radicle node started with provided passphrase.")
             self.radicle_node_process = child
+            self._status_cache = (None, 0.0) # Node state changed, force the next status check to refresh
             bt.logging.info(f"Radicle node process started. Monitoring output... {child.pid}")
             time.sleep(5) # Give it a few seconds to start up
         except pexpect.exceptions.TIMEOUT as e:
@@ -165,17 +246,37 @@ class Miner:
             bt.logging.error(f"Failed to start Radicle node: {e}")
             self.radicle_node_process = None
 
-    def _log_radicle_node_output(self):
-        if self.radicle_node_process and self.radicle_node_process.stdout:
+    async def _drain_radicle_output(self):
+        """
+        Background task that pumps output from the Radicle node's pexpect child into the debug log.
+        Each poll is a zero-timeout read in a worker thread, so it returns at once and no read is ever abandoned mid-flight.
+        Multibyte characters and lines split across reads are reassembled before logging.
+        """
+        drained_child = None
+        while True:
+            child = self.radicle_node_process
+            if child is None:
+                await asyncio.sleep(1)
+                continue
+            if child is not drained_child: # New or restarted node, drop what was left of the previous one's output
+                drained_child = child
+                self._node_output_decoder.reset()
+                self._node_output_tail = ""
             try:
-                for line in iter(self.radicle_node_process.stdout.readline, ''):
-                    if not line: break # End of stream
-                    bt.logging.debug(f"[RadicleNode STDOUT] {line.strip()}")
-                for line in iter(self.radicle_node_process.stderr.readline, ''):
-                    if not line: break
-                    bt.logging.warning(f"[RadicleNode STDERR] {line.strip()}")
-            except Exception: # Handle if stream is closed or other errors
-                pass
+                chunk = await asyncio.to_thread(child.read_nonblocking, 4096, 0)
+            except (pexpect.exceptions.TIMEOUT, pexpect.exceptions.EOF):
+                # Nothing buffered right now (or the node exited; the watchdog in run_async handles restarts)
+                await asyncio.sleep(1)
+                continue
+            except Exception as e:
+                bt.logging.debug(f"Stopped reading Radicle node output: {e}")
+                await asyncio.sleep(1)
+                continue
+            lines = (self._node_output_tail + self._node_output_decoder.decode(chunk)).split("\n")
+            self._node_output_tail = lines.pop() # Unfinished last line, completed by the next read
+            for line in lines:
+                if line.strip():
+                    bt.logging.debug(f"[RadicleNode] {line.strip()}")
 
 
     def setup_bittensor_objects(self):
@@ -187,244 +288,297 @@ class Miner:
         self.metagraph = self.subtensor.metagraph(self.config.netuid)
         bt.logging.info(f"Metagraph: {self.metagraph}")
 
-        if self.wallet.hotkey.ss58_address not in self.metagraph.hotkeys:
+        self._rebuild_hotkey_index()
+        hotkey_to_uid, _ = self._uid_index
+        if self.wallet.hotkey.ss58_address not in hotkey_to_uid:
             bt.logging.error(f"Your miner: {self.wallet} is not registered to chain connection: {self.subtensor}. Run 'btcli s register --netuid {self.config.netuid}' and try again.")
             exit()
-        self.my_subnet_uid = self.metagraph.hotkeys.index(self.wallet.hotkey.ss58_address)
+        self.my_subnet_uid = hotkey_to_uid[self.wallet.hotkey.ss58_address]
         bt.logging.info(f"Running miner on uid: {self.my_subnet_uid}")
 
+    def _rebuild_hotkey_index(self):
+        """
+        Maps each registered hotkey to its UID so per-request lookups are O(1) instead of scanning metagraph.hotkeys,
+        and snapshots stake as plain floats so blacklist/priority checks skip per-request tensor indexing.
+        Both are published as one (hotkey_to_uid, stake) tuple, so axon threads never see a map and stake list from different syncs.
+        """
+        hotkey_to_uid = {hotkey: uid for uid, hotkey in enumerate(self.metagraph.hotkeys)}
+        stake = [float(s) for s in self.metagraph.S.tolist()]
+        self._uid_index = (hotkey_to_uid, stake)
+
     def blacklist_fn(self, synapse: RadicleSubnetSynapse) -> Tuple[bool, str]:
-        if synapse.dendrite.hotkey not in self.metagraph.hotkeys:
-            bt.logging.trace(f"Blacklisting unrecognized hotkey {synapse.dendrite.hotkey}")
+        hotkey_to_uid, stake = self._uid_index # Load the snapshot once
+        requester_uid = hotkey_to_uid.get(synapse.dendrite.hotkey)
+        if requester_uid is None:
+            if self.trace_enabled:
+                bt.logging.trace(f"Blacklisting unrecognized hotkey {synapse.dendrite.hotkey}")
             return True, "Unrecognized hotkey"
         
         # Additional blacklist logic can be added here (e.g., based on stake, trust, etc.)
-        requester_uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-        if self.metagraph.S[requester_uid] < 1 : # Example: min stake of 1000 TAO for validators, for testing purposes we use 1
-             bt.logging.trace(f"Blacklisting hotkey {synapse.dendrite.hotkey} due to low stake: {self.metagraph.S[requester_uid]}")
+        if stake[requester_uid] < 1 : # Example: min stake of 1000 TAO for validators, for testing purposes we use 1
+             if self.trace_enabled:
+                 bt.logging.trace(f"Blacklisting hotkey {synapse.dendrite.hotkey} due to low stake: {stake[requester_uid]}")
              return True, "Low stake"
 
-        bt.logging.trace(f"Not blacklisting recognized hotkey {synapse.dendrite.hotkey}")
+        if self.trace_enabled:
+            bt.logging.trace(f"Not blacklisting recognized hotkey {synapse.dendrite.hotkey}")
         return False, "Allowed"
 
     def priority_fn(self, synapse: RadicleSubnetSynapse) -> float:
         # Prioritize validators with higher stake.
-        caller_uid = self.metagraph.hotkeys.index(synapse.dendrite.hotkey)
-        priority = float(self.metagraph.S[caller_uid])
-        bt.logging.trace(f"Priority for {synapse.dendrite.hotkey}: {priority}")
+        hotkey_to_uid, stake = self._uid_index # Load the snapshot once
+        caller_uid = hotkey_to_uid.get(synapse.dendrite.hotkey)
+        priority = stake[caller_uid] if caller_uid is not None else 0.0
+        if self.trace_enabled:
+            bt.logging.trace(f"Priority for {synapse.dendrite.hotkey}: {priority}")
         return priority
 
-    def forward_radicle_operation(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
-        bt.logging.info(f"Received operation: {synapse.operation_type} from {synapse.dendrite.hotkey}")
+    def _handle_validate_push(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Seeds the validator's repository and confirms it shows up in `rad ls --seeded`."""
+        if not synapse.repo_rid:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "repo_rid not provided for VALIDATE_PUSH"
+            synapse.validation_passed = False
+            return synapse
 
-        if synapse.operation_type == "VALIDATE_PUSH":
-            if not synapse.repo_rid:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "repo_rid not provided for VALIDATE_PUSH"
-                synapse.validation_passed = False
-                return synapse
-
-            # Attempt to track/seed the RID to confirm it's on the network and accessible
-            # `rad seed <rid>` ensures it's seeded. `rad track <rid>` just follows.
-            # For validation, ensuring it's seeded by this miner is a good check.
-            bt.logging.info(f"Validator requests push validation for RID: {synapse.repo_rid}")
-            success, stdout, stderr = run_command(f"rad seed {synapse.repo_rid}")
-            # `rad seed` might not give immediate feedback if already seeded.
-            # A better check might be `rad inspect <rid>` or checking `rad seed list`
-            
-            # Let's check if it's in the seed list
-            time.sleep(2) # Give some time for seeding to potentially propagate
-            list_success, list_stdout, list_stderr = run_command("rad ls --seeded")
-            if list_success and synapse.repo_rid in list_stdout:
-                bt.logging.info(f"Successfully verified and seeding RID: {synapse.repo_rid}")
-                synapse.status_message = "SUCCESS"
-                synapse.validation_passed = True
-            else:
-                bt.logging.warning(f"Failed to confirm seeding for RID: {synapse.repo_rid}. Seed cmd success: {success}, stdout: {stdout}, stderr: {stderr}. List cmd success: {list_success}, list_stdout: {list_stdout}, list_stderr: {list_stderr}")
-                synapse.status_message = "FAILURE"
-                synapse.validation_passed = False
-                synapse.error_message = f"Could not confirm seeding of RID {synapse.repo_rid}. Radicle seed output: {stderr}. Radicle list output: {list_stderr}"
-
-        elif synapse.operation_type == "GET_MINER_STATUS":
-            bt.logging.info("Validator requests miner status.")
-            status_success, status_stdout, status_stderr = run_command("rad node status")
-            alias_success, alias_stdout, _ = run_command("rad self --alias", suppress_error=True)
-            id_success, id_stdout, _ = run_command("rad self --nid", suppress_error=True)
-            
-            synapse.is_miner_radicle_node_running = status_success and "running" in status_stdout.lower() and "offline" not in status_stdout.lower()
-            synapse.miner_radicle_node_alias = alias_stdout if alias_success else "N/A"
-            synapse.miner_radicle_node_id = id_stdout if id_success else "N/A"
-
-            if synapse.is_miner_radicle_node_running:
-                list_success, list_stdout, _ = run_command("rad ls --seeded")
-                if list_success:
-                    # Count non-empty lines, as each line is an RID
-                    seeded_rids = [line for line in list_stdout.splitlines() if line.strip().startswith("rad:") and len(line.strip()) > 10]
-                    synapse.seeded_rids_count = len(seeded_rids)
-                else:
-                    synapse.seeded_rids_count = 0
-                synapse.status_message = "SUCCESS"
+        # Attempt to track/seed the RID to confirm it's on the network and accessible
+        # `rad seed <rid>` ensures it's seeded. `rad track <rid>` just follows.
+        # For validation, ensuring it's seeded by this miner is a good check.
+        bt.logging.info(f"Validator requests push validation for RID: {synapse.repo_rid}")
+        success, stdout, stderr = run_command(("rad", "seed", synapse.repo_rid))
+        # `rad seed` might not give immediate feedback if already seeded.
+        # A better check might be `rad inspect <rid>` or checking `rad seed list`
+
+        # Let's check if it's in the seed list
+        time.sleep(2) # Give some time for seeding to potentially propagate
+        list_success, list_stdout, list_stderr = run_command(_ARGV_RAD_LS_SEEDED)
+        if list_success and synapse.repo_rid in list_stdout:
+            bt.logging.info(f"Successfully verified and seeding RID: {synapse.repo_rid}")
+            synapse.status_message = "SUCCESS"
+            synapse.validation_passed = True
+        else:
+            bt.logging.warning(f"Failed to confirm seeding for RID: {synapse.repo_rid}. Seed cmd success: {success}, stdout: {stdout}, stderr: {stderr}. List cmd success: {list_success}, list_stdout: {list_stdout}, list_stderr: {list_stderr}")
+            synapse.status_message = "FAILURE"
+            synapse.validation_passed = False
+            synapse.error_message = f"Could not confirm seeding of RID {synapse.repo_rid}. Radicle seed output: {stderr}. Radicle list output: {list_stderr}"
+        return synapse
+
+    def _handle_get_miner_status(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Reports whether the Radicle node is running, its alias/node ID and how many repositories it seeds."""
+        bt.logging.info("Validator requests miner status.")
+        status_success, status_stdout, status_stderr = self._cached_rad_status()
+        self._retry_radicle_identity() # Not resolved at startup (e.g. rad was not ready yet), try again
+
+        synapse.is_miner_radicle_node_running = status_success and "running" in status_stdout.lower() and "offline" not in status_stdout.lower()
+        synapse.miner_radicle_node_alias = self._rad_alias or "N/A"
+        synapse.miner_radicle_node_id = self._rad_nid or "N/A"
+
+        if synapse.is_miner_radicle_node_running:
+            list_success, list_stdout, _ = run_command(_ARGV_RAD_LS_SEEDED)
+            if list_success:
+                # Count non-empty lines, as each line is an RID; one regex pass instead of splitting and stripping every line
+                synapse.seeded_rids_count = len(_SEEDED_RID_LINE_RE.findall(list_stdout))
             else:
                 synapse.seeded_rids_count = 0
-                synapse.status_message = "FAILURE"
-                synapse.error_message = f"Radicle node not running or status check failed. Output: {status_stdout} {status_stderr}"
-                
-        elif synapse.operation_type == "VALIDATE_CHANGES_SYNC":
-            bt.logging.info(f"Validator requests changes sync validation for RID: {synapse.repo_sync_rid}")
-            if not synapse.repo_sync_rid:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "repo_rid not provided for VALIDATE_CHANGES_SYNC"
-                synapse.changes_synced_successfully = False
-                return synapse
-
-            bt.logging.info(f"Miner: VALIDATE_CHANGES_SYNC request for RID: {synapse.repo_sync_rid}")
-            rad_path = run_command("rad path")[1].strip()
-            # Miner attempts to sync the repository
-            # `rad sync <RID>` should fetch the latest changes pushed by the validator
-            bt.logging.info(f"Miner: Attempting to sync changes for RID {synapse.repo_sync_rid} in directory {rad_path}/storage/{synapse.repo_sync_rid.split(':')[1]}/")
-            # Ensure the directory exists before syncing
-            sync_success, stdout_sync, stderr_sync = run_command(f"rad sync {synapse.repo_sync_rid} --fetch")
-            bt.logging.info(f"suucess {sync_success}, output {stdout_sync} errrr {stderr_sync}")
-
-            
-            if sync_success:
-                # Check if "✓ Synced" or similar success message is in stdout
-                # Radicle's `rad sync` output can vary, be specific if possible.
-                # A simple check for "✓ Synced" or "up to date" can work.
-                if "✓ Synced" in stdout_sync or "up to date" in stdout_sync.lower() or "nothing to sync" in stdout_sync.lower():
-                    bt.logging.info(f"Miner: Successfully synced changes for RID {synapse.repo_sync_rid}. Output: {stdout_sync}")
-                    synapse.changes_synced_successfully = True
-                    synapse.status_message = "SUCCESS"
-                else:
-                    # Sync command ran, but output doesn't confirm sync.
-                    bt.logging.warning(f"Miner: 'rad sync {synapse.repo_sync_rid}' ran, but success message not found in output. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
-                    synapse.changes_synced_successfully = False
-                    synapse.status_message = "FAILURE"
-                    synapse.error_message = f"Sync command output did not confirm sync success. Output: {stdout_sync}"
-            else:
-                bt.logging.warning(f"Miner: Failed to execute 'rad sync {synapse.repo_sync_rid}'. Stderr: {stderr_sync}, Stdout: {stdout_sync}")
-                synapse.changes_synced_successfully = False
-                synapse.status_message = "FAILURE"
-                synapse.error_message = f"rad sync command failed: {stderr_sync or stdout_sync}"
+            synapse.status_message = "SUCCESS"
+        else:
+            synapse.seeded_rids_count = 0
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"Radicle node not running or status check failed. Output: {status_stdout} {status_stderr}"
+        return synapse
 
-        elif synapse.operation_type == "VALIDATE_BRANCH_SYNC":
-            
-            rid_to_sync_branch = synapse.branch_sync_repo_id 
-            bt.logging.info(f"Miner: VALIDATE_BRANCH_SYNC request for RID: {rid_to_sync_branch}")
+    def _handle_changes_sync(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Fetches the latest changes the validator pushed to an already seeded repository."""
+        bt.logging.info(f"Validator requests changes sync validation for RID: {synapse.repo_sync_rid}")
+        if not synapse.repo_sync_rid:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "repo_rid not provided for VALIDATE_CHANGES_SYNC"
+            synapse.changes_synced_successfully = False
+            return synapse
 
-            if not rid_to_sync_branch:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "branch_sync_repo_id not provided for VALIDATE_BRANCH_SYNC"
-                synapse.branch_changes_synced_successfully = False
-                return synapse
-
-            sync_success, stdout_sync, stderr_sync = run_command(f"rad sync {rid_to_sync_branch} --fetch")
-            
-            if sync_success and ("✓ Synced" in stdout_sync or "up to date" in stdout_sync.lower() or "nothing to sync" in stdout_sync.lower()):
-                bt.logging.info(f"Miner: Successfully synced (including branches) for RID {rid_to_sync_branch}. Output: {stdout_sync}")
-                synapse.branch_changes_synced_successfully = True
+        bt.logging.info(f"Miner: VALIDATE_CHANGES_SYNC request for RID: {synapse.repo_sync_rid}")
+        rad_path = self._get_rad_path()
+        # Miner attempts to sync the repository
+        # `rad sync <RID>` should fetch the latest changes pushed by the validator
+        bt.logging.info(f"Miner: Attempting to sync changes for RID {synapse.repo_sync_rid} in directory {rad_path}/storage/{synapse.repo_sync_rid.split(':')[1]}/")
+        # Ensure the directory exists before syncing
+        sync_success, stdout_sync, stderr_sync = run_command(("rad", "sync", synapse.repo_sync_rid, "--fetch"))
+        bt.logging.info(f"suucess {sync_success}, output {stdout_sync} errrr {stderr_sync}")
+
+
+        if sync_success:
+            # Check if "✓ Synced" or similar success message is in stdout
+            # Radicle's `rad sync` output can vary, be specific if possible.
+            # A simple check for "✓ Synced" or "up to date" can work.
+            if _SYNC_OK_RE.search(stdout_sync):
+                bt.logging.info(f"Miner: Successfully synced changes for RID {synapse.repo_sync_rid}. Output: {stdout_sync}")
+                synapse.changes_synced_successfully = True
                 synapse.status_message = "SUCCESS"
             else:
-                bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_branch}' (for branch) failed or success message not found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
-                synapse.branch_changes_synced_successfully = False
+                # Sync command ran, but output doesn't confirm sync.
+                bt.logging.warning(f"Miner: 'rad sync {synapse.repo_sync_rid}' ran, but success message not found in output. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
+                synapse.changes_synced_successfully = False
                 synapse.status_message = "FAILURE"
-                synapse.error_message = f"Branch sync command output did not confirm success. Output: {stdout_sync}"
+                synapse.error_message = f"Sync command output did not confirm sync success. Output: {stdout_sync}"
+        else:
+            bt.logging.warning(f"Miner: Failed to execute 'rad sync {synapse.repo_sync_rid}'. Stderr: {stderr_sync}, Stdout: {stdout_sync}")
+            synapse.changes_synced_successfully = False
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"rad sync command failed: {stderr_sync or stdout_sync}"
+        return synapse
+
+    def _handle_branch_sync(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Fetches a repository after the validator pushed a new branch to it."""
+        rid_to_sync_branch = synapse.branch_sync_repo_id
+        bt.logging.info(f"Miner: VALIDATE_BRANCH_SYNC request for RID: {rid_to_sync_branch}")
+
+        if not rid_to_sync_branch:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "branch_sync_repo_id not provided for VALIDATE_BRANCH_SYNC"
+            synapse.branch_changes_synced_successfully = False
             return synapse
-        
-        elif synapse.operation_type == "VALIDATE_ISSUE_SYNC":
-            rid_to_sync_issue = synapse.issue_sync_repo_id # Use the new field
-            bt.logging.info(f"Miner: VALIDATE_ISSUE_SYNC request for RID: {rid_to_sync_issue}")
 
-            if not rid_to_sync_issue:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "issue_sync_repo_id not provided for VALIDATE_ISSUE_SYNC"
-                synapse.issue_synced_successfully = False
-                return synapse
-
-            # Miner attempts to sync the repository to get the new issue
-            sync_success, stdout_sync, stderr_sync = run_command(f"rad sync {rid_to_sync_issue} --fetch") # --fetch ensures data is pulled
-            
-            
-           
-            if sync_success:
-                # Check general sync success messages
-                if "✓ Synced" in stdout_sync or "up to date" in stdout_sync.lower() or "nothing to sync" in stdout_sync.lower() or "✓ Project data fetched" in stdout_sync:
-                    bt.logging.info(f"Miner: Successfully ran 'rad sync {rid_to_sync_issue}' (for issue). Output: {stdout_sync}")
-                    synapse.issue_synced_successfully = True
-                    synapse.status_message = "SUCCESS"
-                else:
-                    bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_issue}' (for issue) ran, but success message not clearly found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
-                    synapse.issue_synced_successfully = False
-                    synapse.status_message = "FAILURE"
-                    synapse.error_message = f"Issue sync command output did not confirm full sync success. Output: {stdout_sync}"
-                    
-            else:
-                bt.logging.warning(f"Miner: Failed to execute 'rad sync {rid_to_sync_issue}' (for issue). Stderr: {stderr_sync}, Stdout: {stdout_sync}")
-                synapse.issue_synced_successfully = False
-                synapse.status_message = "FAILURE"
-                synapse.error_message = f"rad sync command (for issue) failed: {stderr_sync or stdout_sync}"
+        sync_success, stdout_sync, stderr_sync = run_command(("rad", "sync", rid_to_sync_branch, "--fetch"))
+
+        if sync_success and _SYNC_OK_RE.search(stdout_sync):
+            bt.logging.info(f"Miner: Successfully synced (including branches) for RID {rid_to_sync_branch}. Output: {stdout_sync}")
+            synapse.branch_changes_synced_successfully = True
+            synapse.status_message = "SUCCESS"
+        else:
+            bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_branch}' (for branch) failed or success message not found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
+            synapse.branch_changes_synced_successfully = False
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"Branch sync command output did not confirm success. Output: {stdout_sync}"
+        return synapse
+
+    def _handle_issue_sync(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Fetches a repository after the validator opened an issue on it."""
+        rid_to_sync_issue = synapse.issue_sync_repo_id # Use the new field
+        bt.logging.info(f"Miner: VALIDATE_ISSUE_SYNC request for RID: {rid_to_sync_issue}")
+
+        if not rid_to_sync_issue:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "issue_sync_repo_id not provided for VALIDATE_ISSUE_SYNC"
+            synapse.issue_synced_successfully = False
             return synapse
-        
-        elif synapse.operation_type == "VALIDATE_PATCH_SYNC":
-            rid_to_sync_patch = synapse.patch_sync_repo_id
-            bt.logging.info(f"Miner: VALIDATE_PATCH_SYNC request for RID: {rid_to_sync_patch}")
 
-            if not rid_to_sync_patch:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "patch_sync_repo_id (or repo_rid) not provided for VALIDATE_PATCH_SYNC"
-                synapse.patch_synced_successfully = False
-                return synapse
-
-            # Miner attempts to sync the repository to get the new patch
-            sync_success, stdout_sync, stderr_sync = run_command(f"rad sync {rid_to_sync_patch} --fetch")
-            
-            if sync_success:
-                # Check for general sync success messages. 
-                # Specific patch confirmation is harder without knowing the patch COB ID.
-                if "✓ Synced" in stdout_sync or "up to date" in stdout_sync.lower() or "nothing to sync" in stdout_sync.lower() or "✓ Project data fetched" in stdout_sync:
-                    bt.logging.info(f"Miner: Successfully ran 'rad sync {rid_to_sync_patch}' (for patch). Output: {stdout_sync}")
-                    synapse.patch_synced_successfully = True
-                    synapse.status_message = "SUCCESS"
-                else:
-                    bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_patch}' (for patch) ran, but success message not clearly found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
-                    synapse.patch_synced_successfully = False
-                    synapse.status_message = "FAILURE"
-                    synapse.error_message = f"Patch sync command output did not confirm full sync success. Output: {stdout_sync}"
+        # Miner attempts to sync the repository to get the new issue
+        sync_success, stdout_sync, stderr_sync = run_command(("rad", "sync", rid_to_sync_issue, "--fetch")) # --fetch ensures data is pulled
+
+
+
+        if sync_success:
+            # Check general sync success messages
+            if _SYNC_OR_FETCH_OK_RE.search(stdout_sync):
+                bt.logging.info(f"Miner: Successfully ran 'rad sync {rid_to_sync_issue}' (for issue). Output: {stdout_sync}")
+                synapse.issue_synced_successfully = True
+                synapse.status_message = "SUCCESS"
             else:
-                bt.logging.warning(f"Miner: Failed to execute 'rad sync {rid_to_sync_patch}' (for patch). Stderr: {stderr_sync}, Stdout: {stdout_sync}")
-                synapse.patch_synced_successfully = False
+                bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_issue}' (for issue) ran, but success message not clearly found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
+                synapse.issue_synced_successfully = False
                 synapse.status_message = "FAILURE"
-                synapse.error_message = f"rad sync command (for patch) failed: {stderr_sync or stdout_sync}"
+                synapse.error_message = f"Issue sync command output did not confirm full sync success. Output: {stdout_sync}"
+
+        else:
+            bt.logging.warning(f"Miner: Failed to execute 'rad sync {rid_to_sync_issue}' (for issue). Stderr: {stderr_sync}, Stdout: {stdout_sync}")
+            synapse.issue_synced_successfully = False
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"rad sync command (for issue) failed: {stderr_sync or stdout_sync}"
+        return synapse
+
+    def _handle_patch_sync(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Fetches a repository after the validator published a patch to it."""
+        rid_to_sync_patch = synapse.patch_sync_repo_id
+        bt.logging.info(f"Miner: VALIDATE_PATCH_SYNC request for RID: {rid_to_sync_patch}")
+
+        if not rid_to_sync_patch:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "patch_sync_repo_id (or repo_rid) not provided for VALIDATE_PATCH_SYNC"
+            synapse.patch_synced_successfully = False
             return synapse
-        
-        elif synapse.operation_type == "UNSEED_REPO":
-            if not synapse.repo_rid:
-                synapse.status_message = "FAILURE"
-                synapse.error_message = "repo_rid not provided for UNSEED_REPO"
-                synapse.unseed_command_successful = False
-                return synapse
-
-            bt.logging.info(f"Miner: Received UNSEED_REPO request for RID: {synapse.repo_rid} from {synapse.dendrite.hotkey}")
-            
-            unseed_success, stdout, stderr = run_command(f"rad unseed {synapse.repo_rid}")
-            
-            if unseed_success:
-                bt.logging.info(f"Miner: Successfully executed 'rad unseed {synapse.repo_rid}'. Output: {stdout}")
-                rad_path = run_command("rad path")[1].strip()
-                dlt_success, dlt_stdout, dlt_stderr = run_command(f"rm -rf {rad_path}/storage/{synapse.repo_rid.split(':')[1]}")
-                bt.logging.info(f"Miner: Successfully deleted local Radicle directory for {synapse.repo_rid}. Output: {dlt_stdout}, Error: {dlt_stderr}, Success: {dlt_success}")
-                synapse.unseed_command_successful = True
+
+        # Miner attempts to sync the repository to get the new patch
+        sync_success, stdout_sync, stderr_sync = run_command(("rad", "sync", rid_to_sync_patch, "--fetch"))
+
+        if sync_success:
+            # Check for general sync success messages. 
+            # Specific patch confirmation is harder without knowing the patch COB ID.
+            if _SYNC_OR_FETCH_OK_RE.search(stdout_sync):
+                bt.logging.info(f"Miner: Successfully ran 'rad sync {rid_to_sync_patch}' (for patch). Output: {stdout_sync}")
+                synapse.patch_synced_successfully = True
                 synapse.status_message = "SUCCESS"
             else:
-                bt.logging.warning(f"Miner: Failed to execute 'rad unseed {synapse.repo_rid}'. Stderr: {stderr}, Stdout: {stdout}")
-                synapse.unseed_command_successful = False
+                bt.logging.warning(f"Miner: 'rad sync {rid_to_sync_patch}' (for patch) ran, but success message not clearly found. Stdout: {stdout_sync}, Stderr: {stderr_sync}")
+                synapse.patch_synced_successfully = False
                 synapse.status_message = "FAILURE"
-                synapse.error_message = f"rad unseed command failed: {stderr or stdout}"
+                synapse.error_message = f"Patch sync command output did not confirm full sync success. Output: {stdout_sync}"
+        else:
+            bt.logging.warning(f"Miner: Failed to execute 'rad sync {rid_to_sync_patch}' (for patch). Stderr: {stderr_sync}, Stdout: {stdout_sync}")
+            synapse.patch_synced_successfully = False
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"rad sync command (for patch) failed: {stderr_sync or stdout_sync}"
+        return synapse
+
+    def _handle_unseed_repo(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """Stops seeding a repository and deletes its local storage."""
+        if not synapse.repo_rid:
+            synapse.status_message = "FAILURE"
+            synapse.error_message = "repo_rid not provided for UNSEED_REPO"
+            synapse.unseed_command_successful = False
             return synapse
 
+        bt.logging.info(f"Miner: Received UNSEED_REPO request for RID: {synapse.repo_rid} from {synapse.dendrite.hotkey}")
+
+        unseed_success, stdout, stderr = run_command(("rad", "unseed", synapse.repo_rid))
+
+        if unseed_success:
+            bt.logging.info(f"Miner: Successfully executed 'rad unseed {synapse.repo_rid}'. Output: {stdout}")
+            self._remove_repo_storage(synapse.repo_rid)
+            synapse.unseed_command_successful = True
+            synapse.status_message = "SUCCESS"
         else:
+            bt.logging.warning(f"Miner: Failed to execute 'rad unseed {synapse.repo_rid}'. Stderr: {stderr}, Stdout: {stdout}")
+            synapse.unseed_command_successful = False
+            synapse.status_message = "FAILURE"
+            synapse.error_message = f"rad unseed command failed: {stderr or stdout}"
+        return synapse
+
+    def _remove_repo_storage(self, repo_rid: str):
+        """
+        Deletes <rad path>/storage/<id> for an unseeded RID in-process. The RID comes from the request, so the
+        resolved target must stay strictly inside the storage directory before anything is removed.
+        """
+        rad_path = self._get_rad_path()
+        repo_id = repo_rid.partition(":")[2]
+        if not rad_path or not repo_id:
+            bt.logging.warning(f"Miner: Not deleting local Radicle directory for {repo_rid}: rad path or repository id unavailable.")
+            return
+        storage_root = os.path.realpath(os.path.join(rad_path, "storage"))
+        target = os.path.realpath(os.path.join(storage_root, repo_id))
+        if target == storage_root or os.path.commonpath([storage_root, target]) != storage_root:
+            bt.logging.warning(f"Miner: Refusing to delete {target} for {repo_rid}: outside Radicle storage {storage_root}.")
+            return
+        try:
+            shutil.rmtree(target)
+            bt.logging.info(f"Miner: Successfully deleted local Radicle directory for {repo_rid}: {target}")
+        except FileNotFoundError:
+            bt.logging.info(f"Miner: Local Radicle directory for {repo_rid} already absent: {target}")
+        except OSError as e:
+            bt.logging.warning(f"Miner: Failed to delete local Radicle directory {target} for {repo_rid}: {e}")
+
+    async def forward_radicle_operation(self, synapse: RadicleSubnetSynapse) -> RadicleSubnetSynapse:
+        """
+        Axon entry point. The axon awaits this on its event loop, so the handlers, which block on rad/git
+        subprocesses, run on a worker thread and other requests keep being served meanwhile.
+        """
+        bt.logging.info(f"Received operation: {synapse.operation_type} from {synapse.dendrite.hotkey}")
+
+        handler = self._operation_handlers.get(synapse.operation_type)
+        if handler is None:
             synapse.status_message = "FAILURE"
             synapse.error_message = f"Unknown operation_type: {synapse.operation_type}"
+        else:
+            await asyncio.to_thread(handler, synapse)
 
         bt.logging.info(f"Responding to {synapse.dendrite.hotkey}: {synapse.status_message}, Validation: {synapse.validation_passed}, Error: {synapse.error_message}")
         return synapse
@@ -443,34 +597,45 @@ class Miner:
         bt.logging.info(f"Starting axon server on port: {self.config.axon.port}")
         self.axon.start()
 
-    def run(self):
+    async def _periodic(self, interval: float, job):
+        """Awaits job() now and then every `interval` seconds; the task sleeps for the whole period instead of polling."""
+        while True:
+            await job()
+            await asyncio.sleep(interval)
+
+    async def _check_radicle_node(self):
+        # Check if radicle_node_process is still alive
+        if self.radicle_node_process and self.radicle_node_process.pid is None:
+            bt.logging.error(f"Radicle node process terminated unexpectedly with code {self.radicle_node_process.codec_errors}. Restarting...")
+            # Restart probes `rad node status` and waits on pexpect, keep it off the event loop
+            await asyncio.get_running_loop().run_in_executor(None, self.start_radicle_node)
+
+    async def _sync_metagraph(self):
+        await asyncio.get_running_loop().run_in_executor(None, lambda: self.metagraph.sync(subtensor=self.subtensor)) # Sync metagraph
+        self._rebuild_hotkey_index() # Registrations and stake may have changed with the sync
+        log_str = (
+            f"Block:{self.metagraph.block.item()} | "
+            f"Stake:{self.metagraph.S[self.my_subnet_uid]} | "
+            f"Trust:{self.metagraph.T[self.my_subnet_uid]} | "
+            f"Incentive:{self.metagraph.I[self.my_subnet_uid]} | "
+            f"Emission:{self.metagraph.E[self.my_subnet_uid]}"
+        )
+        bt.logging.info(log_str)
+
+    async def run_async(self):
         self.setup_axon()
         bt.logging.info(f"Miner started. UID: {self.my_subnet_uid}. Radicle Node Alias: {self.config.radicle.node.alias}")
-        step = 0
+        drain_task = asyncio.create_task(self._drain_radicle_output())
+        # Each periodic job runs on its own period, the loop no longer wakes every second to test a step counter
+        periodic_tasks = [
+            asyncio.create_task(self._periodic(30, self._check_radicle_node)),
+            asyncio.create_task(self._periodic(60, self._sync_metagraph)),
+        ]
         try:
-            while True:
-                # Log Radicle node output periodically if it was started by this script
-                if step % 30 == 0 and self.radicle_node_process:
-                     self._log_radicle_node_output()
-                     # Check if radicle_node_process is still alive
-                     if self.radicle_node_process.pid is None:
-                         bt.logging.error(f"Radicle node process terminated unexpectedly with code {self.radicle_node_process.codec_errors}. Restarting...")
-                         self.start_radicle_node() # Attempt to restart
-
-                if step % 60 == 0:
-                    self.metagraph.sync(subtensor=self.subtensor) # Sync metagraph
-                    log_str = (
-                        f"Step:{step} | Block:{self.metagraph.block.item()} | "
-                        f"Stake:{self.metagraph.S[self.my_subnet_uid]} | "
-                        f"Trust:{self.metagraph.T[self.my_subnet_uid]} | "
-                        f"Incentive:{self.metagraph.I[self.my_subnet_uid]} | "
-                        f"Emission:{self.metagraph.E[self.my_subnet_uid]}"
-                    )
-                    bt.logging.info(log_str)
-                step += 1
-                time.sleep(1)
-
-        except KeyboardInterrupt:
+            # Only returns by raising: a failing job propagates here, Ctrl+C arrives as a cancellation
+            await asyncio.gather(*periodic_tasks)
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            # asyncio.run() surfaces Ctrl+C inside the coroutine as a cancellation
             self.axon.stop()
             if self.radicle_node_process:
                 bt.logging.info("Stopping Radicle node process...")
@@ -485,11 +650,19 @@ class Miner:
             self.radicle_node_process.terminate()
             bt.logging.error(traceback.format_exc())
         finally:
+            drain_task.cancel()
+            for task in periodic_tasks:
+                task.cancel()
             if self.axon:
                 self.axon.stop()
             if self.radicle_node_process and self.radicle_node_process.pid is None:
                 self.radicle_node_process.kill()
 
+    def run(self):
+        try:
+            asyncio.run(self.run_async())
+        except KeyboardInterrupt:
+            pass
 
 if __name__ == "__main__":
     miner = Miner()
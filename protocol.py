@@ -1,6 +1,18 @@
-import typing
+import hashlib
+from enum import Enum
 import bittensor as bt
-from typing import Optional, List
+from typing import Optional, List, Tuple, ClassVar
+
+class RadicleOperation(str, Enum):
+    """Values accepted in RadicleSubnetSynapse.operation_type."""
+    VALIDATE_PUSH = "VALIDATE_PUSH"
+    GET_MINER_STATUS = "GET_MINER_STATUS"
+    VALIDATE_CHANGES_SYNC = "VALIDATE_CHANGES_SYNC"
+    VALIDATE_BRANCH_SYNC = "VALIDATE_BRANCH_SYNC"
+    VALIDATE_ISSUE_SYNC = "VALIDATE_ISSUE_SYNC"
+    VALIDATE_PATCH_SYNC = "VALIDATE_PATCH_SYNC"
+    UNSEED_REPO = "UNSEED_REPO"
+
 
 class RadicleSubnetSynapse(bt.Synapse):
     """
@@ -65,50 +77,29 @@ class RadicleSubnetSynapse(bt.Synapse):
     # axon_hotkey: Optional[str] = None
     # dendrite_hotkey: Optional[str] = None
 
-    def deserialize(self) -> "RadicleSubnetSynapse":
-        return self
+    # Optional fields that are hashed when set, in hashing order (the order is part of the digest).
+    _HASH_CANDIDATE_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "repo_rid", "commit_hash", "repo_sync_rid", "branch_sync_repo_id", "issue_sync_repo_id", "patch_sync_repo_id",
+        "unseed_command_successful", "changes_synced_successfully", "branch_changes_synced_successfully",
+        "issue_synced_successfully", "patch_synced_successfully",
+    )
 
     @property
     def required_hash_fields(self) -> List[str]:
-        fields = ["operation_type"]
-        # If these fields are part of the request, they should be hashed.
+        # operation_type is always hashed; optional request/response fields only when they are set.
         # The Synapse base class handles None values appropriately during hashing.
-        if self.repo_rid is not None:
-            fields.append("repo_rid")
-        if self.commit_hash is not None:
-            fields.append("commit_hash")
-        if self.repo_sync_rid is not None:
-            fields.append("repo_sync_rid")
-        if self.branch_sync_repo_id is not None: 
-            fields.append("branch_sync_repo_id")
-        if self.issue_sync_repo_id is not None: 
-            fields.append("issue_sync_repo_id")  
-        if self.patch_sync_repo_id is not None: 
-            fields.append("patch_sync_repo_id")  
-        
-        #Add unseed_command_successful to hashed fields if present
-        if self.unseed_command_successful is not None:
-            fields.append("unseed_command_successful")
-        if self.changes_synced_successfully is not None:
-            fields.append("changes_synced_successfully")
-        if self.branch_changes_synced_successfully is not None:
-            fields.append("branch_changes_synced_successfully") 
-        if self.issue_synced_successfully is not None: 
-            fields.append("issue_synced_successfully")
-        if self.patch_synced_successfully is not None: 
-            fields.append("patch_synced_successfully") 
-
-        return fields
-    
+        return ["operation_type", *(f for f in self._HASH_CANDIDATE_FIELDS if getattr(self, f) is not None)]
+
     @property
     def body_hash(self) -> str:
         """
         Override body_hash to ensure required_hash_fields is accessed correctly.
+        Field values are concatenated and digested in a single call; the result is
+        identical to feeding them to sha256 one by one.
         """
-        import hashlib
-        m = hashlib.sha256()
-        for field in self.required_hash_fields: 
+        parts = []
+        for field in self.required_hash_fields:
             value = getattr(self, field, None)
             if value is not None:
-                m.update(str(value).encode('utf-8'))
-        return m.hexdigest()
\ No newline at end of file
+                parts.append(str(value).encode('utf-8'))
+        return hashlib.sha256(b"".join(parts)).hexdigest()
@@ -7,32 +7,71 @@ import bittensor as bt
 import subprocess
 import shutil
 import uuid
+import itertools
 import shlex
-from typing import Tuple, Optional, List
+import weakref
+from typing import Tuple, Optional, List, Dict
 import asyncio
-import pexpect
 import re
 import torch
-from protocol import RadicleSubnetSynapse
+from protocol import RadicleSubnetSynapse, RadicleOperation
+
+RADICLE_PASSPHRASE = "<YOUR_RADICAL_PASSPHRASE>" # Replace with your actual passphrase; passed to rad via RAD_PASSPHRASE
+# git's messages for a commit with nothing staged; matched case-insensitively in one pass instead of lower() per check
+_NOTHING_TO_COMMIT_RE = re.compile(r"nothing to commit|no changes added|working tree clean", re.IGNORECASE)
+# `rad issue open` output confirming the issue was announced to seeds
+_SYNCED_MARKER = "✓ Synced"
+_SEEDS_MARKER = "seed(s)"
+
+# Environment for rad commands that may need to unlock the identity, built once instead of copying os.environ per call
+_RAD_ENV = {**os.environ, "RAD_PASSPHRASE": RADICLE_PASSPHRASE}
 
 # Helper function to run shell commands
-def run_command(command: str, suppress_error: bool = False, cwd: Optional[str] = None) -> Tuple[bool, str, str]:
+def run_command(command: str, suppress_error: bool = False, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
     """Executes a shell command and returns success, stdout, and stderr."""
     try:
         bt.logging.debug(f"Running command: {command} (cwd: {cwd})")
-        process = subprocess.Popen(shlex.split(command), stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, cwd=cwd)
-        stdout, stderr = process.communicate(timeout=120) # 120 second timeout for potentially long git/rad ops
+        completed = subprocess.run(shlex.split(command), capture_output=True, timeout=120, cwd=cwd, env=env) # 120 second timeout for potentially long git/rad ops
+        # Decode once as UTF-8 regardless of locale; rad prints non-ASCII markers such as '✓'
+        stdout, stderr = completed.stdout.decode('utf-8', 'replace').strip(), completed.stderr.decode('utf-8', 'replace').strip()
+        success = completed.returncode == 0
+        if not success and not suppress_error:
+            bt.logging.error(f"Command failed: {command}\nStderr: {stderr}\nStdout: {stdout}")
+        return success, stdout, stderr
+    except subprocess.TimeoutExpired:
+        # subprocess.run has already killed and reaped the child
+        bt.logging.error(f"Command timed out: {command}")
+        return False, "", "Timeout expired"
+    except Exception as e:
+        bt.logging.error(f"Error running command {command}: {e}")
+        return False, "", str(e)
+
+async def run_command_async(command: str, suppress_error: bool = False, cwd: Optional[str] = None, env: Optional[Dict[str, str]] = None) -> Tuple[bool, str, str]:
+    """Async counterpart of run_command for non-interactive commands; pipes are read by the event loop."""
+    process = None
+    try:
+        bt.logging.debug(f"Running command (async): {command} (cwd: {cwd})")
+        process = await asyncio.create_subprocess_exec(*shlex.split(command), stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE, cwd=cwd, env=env)
+        stdout_b, stderr_b = await asyncio.wait_for(process.communicate(), timeout=120)
+        stdout, stderr = stdout_b.decode('utf-8', 'replace'), stderr_b.decode('utf-8', 'replace')
         success = process.returncode == 0
         if not success and not suppress_error:
             bt.logging.error(f"Command failed: {command}\nStderr: {stderr.strip()}\nStdout: {stdout.strip()}")
         return success, stdout.strip(), stderr.strip()
-    except subprocess.TimeoutExpired:
+    except asyncio.TimeoutError:
         bt.logging.error(f"Command timed out: {command}")
-        process.kill() # Ensure the process is killed on timeout
         return False, "", "Timeout expired"
     except Exception as e:
         bt.logging.error(f"Error running command {command}: {e}")
         return False, "", str(e)
+    finally:
+        # Also reached on cancellation (Ctrl+C, a cancelled gather), which then propagates; never leave the child running
+        if process is not None and process.returncode is None:
+            try:
+                process.kill()
+            except ProcessLookupError: # Exited but not reaped yet
+                pass
+            await process.wait()
 
 class Validator:
     def __init__(self):
@@ -42,11 +81,16 @@ class Validator:
         self.ensure_radicle_auth()       # Ensure validator identity
         self.setup_bittensor_objects()
         # Initialize scores and moving averages
-        self.scores = torch.zeros(self.metagraph.n.item(), dtype=torch.float32)
-        self.moving_avg_scores = torch.zeros(self.metagraph.n.item(), dtype=torch.float32)
+        self.scores = torch.zeros(self.n, dtype=torch.float32)
+        self.moving_avg_scores = torch.zeros(self.n, dtype=torch.float32)
         self.alpha = self.config.validator.alpha # Weight for moving average
         self.query_timeout = 55 # seconds for dendrite queries
         self.steps_passed = 0
+        # Source of unique scratch-dir, branch and file-name suffixes (see _unique_token)
+        self._name_seq = itertools.count()
+        self._pid = os.getpid()
+        # One lock per RID being cloned; entries disappear once no task holds the lock (see _clone_lock)
+        self._clone_locks = weakref.WeakValueDictionary()
 
     def get_config(self):
         parser = argparse.ArgumentParser()
@@ -61,6 +105,12 @@ class Validator:
             default=0.05,
             help="Alpha for exponential moving average of scores.",
         )
+        parser.add_argument(
+            "--validator.preserve_scores_on_resync",
+            action=argparse.BooleanOptionalAction,
+            default=True,
+            help="Carry scores over to the new UID of each hotkey after a metagraph resync instead of resetting them.",
+        )
         parser.add_argument(
             "--netuid", type=int, default=1, help="The chain subnet uid."
         )
@@ -109,7 +159,7 @@ class Validator:
         # If not, try to create one with the specified alias.
         if not os.path.exists(radicle_home_keys):
             bt.logging.info(f"Radicle keys not found. Attempting to authenticate as '{self.config.radicle.validator.alias}'.")
-            success, stdout, stderr = run_command(f"rad auth --alias {self.config.radicle.validator.alias}")
+            success, stdout, stderr = run_command(f"rad auth --alias {self.config.radicle.validator.alias}", env=_RAD_ENV)
             if not success:
                 bt.logging.error(f"Failed to authenticate Radicle identity for validator: {stderr}. Please run 'rad auth --alias {self.config.radicle.validator.alias}' manually.")
                 # It might be okay to continue if `rad` commands can run anonymously for some operations,
@@ -121,7 +171,7 @@ class Validator:
             bt.logging.info(f"Radicle keys directory found. Assuming identity '{self.config.radicle.validator.alias}' is available or will be created/used by rad commands.")
             # Verify if the specific alias is active, or just use default.
             # `rad auth {self.config.radicle.validator.alias}` can also select an existing one.
-            run_command(f"rad auth {self.config.radicle.validator.alias}", suppress_error=True)
+            run_command(f"rad auth {self.config.radicle.validator.alias}", suppress_error=True, env=_RAD_ENV)
 
     def setup_bittensor_objects(self):
         bt.logging.info("Setting up Bittensor objects.")
@@ -134,31 +184,71 @@ class Validator:
         self.metagraph = self.subtensor.metagraph(self.config.netuid)
         bt.logging.info(f"Metagraph: {self.metagraph}")
 
-        if self.wallet.hotkey.ss58_address not in self.metagraph.hotkeys:
+        self._rebuild_hotkey_index()
+        if self.wallet.hotkey.ss58_address not in self._hotkey_to_uid:
             bt.logging.error(f"Your validator: {self.wallet} is not registered to chain connection: {self.subtensor}. Run 'btcli s register --netuid {self.config.netuid}' and try again.")
             exit()
-        self.my_subnet_uid = self.metagraph.hotkeys.index(self.wallet.hotkey.ss58_address)
+        self.my_subnet_uid = self._hotkey_to_uid[self.wallet.hotkey.ss58_address]
         bt.logging.info(f"Running validator on uid: {self.my_subnet_uid}")
+        # Hotkeys are immutable ss58 strings, a shallow tuple snapshot is enough to detect changes after a sync
+        self.hotkeys = tuple(self.metagraph.hotkeys)
+        self.n = int(self.metagraph.n) # Cached metagraph size, refreshed after every sync that changes hotkeys
+        self._cache_sync_state()
+
+    def _rebuild_hotkey_index(self):
+        """Maps each registered hotkey to its UID so lookups are O(1) instead of scanning metagraph.hotkeys."""
+        self._hotkey_to_uid = {hotkey: uid for uid, hotkey in enumerate(self.metagraph.hotkeys)}
+
+    def _cache_sync_state(self):
+        """Reads values that only change between metagraph syncs: the subnet tempo, the block at which this validator last set weights and the serving UIDs."""
+        self.tempo = self.subtensor.tempo(self.config.netuid)
+        # Axon info is only refreshed by metagraph.sync, so the serving set is computed once per sync rather than per round
+        self._serving_uids = [uid for uid, axon in enumerate(self.metagraph.axons) if axon.is_serving]
+        try:
+            self._last_update_self = int(self.metagraph.last_update[self.my_subnet_uid])
+        except Exception as e:
+            bt.logging.warning(f"Could not get last_set_weights_block for validator UID {self.my_subnet_uid}, defaulting to 0. Error: {e}")
+            self._last_update_self = 0
+
+    def _unique_token(self) -> str:
+        """Process-unique suffix (pid + counter) for names created each round; safe to call from the clone threads."""
+        return f"{self._pid}-{next(self._name_seq)}"
+
+    def _clone_lock(self, repo_rid: str) -> asyncio.Lock:
+        """
+        Lock serializing `rad clone` of one RID. Every clone fetches into the validator's single Radicle storage,
+        and concurrent fetches of the same repository can fail on ref locks or sigrefs updates.
+        """
+        lock = self._clone_locks.get(repo_rid)
+        if lock is None:
+            lock = self._clone_locks[repo_rid] = asyncio.Lock()
+        return lock
+
+    async def clone_repository_serialized(self, repo_rid: str, miner_node_id: str):
+        """Runs clone_repository_locally on a worker thread, one clone of `repo_rid` at a time."""
+        async with self._clone_lock(repo_rid):
+            return await asyncio.to_thread(self.clone_repository_locally, repo_rid, miner_node_id)
 
     def create_and_push_radicle_repo(self) -> Tuple[Optional[str], Optional[str], Optional[str]]:
         """Creates a temporary Git repo, initializes it with Radicle, and pushes it."""
-        repo_name = f"test-repo-{str(uuid.uuid4())[:8]}"
+        repo_name = f"test-repo-{self._unique_token()}"
         temp_dir = os.path.join("/tmp", repo_name)  # Use /tmp to isolate each repo
         try:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
-            os.makedirs(temp_dir)
+            try:
+                os.makedirs(temp_dir)
+            except FileExistsError: # Leftover from an earlier run with the same name
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                os.makedirs(temp_dir)
 
             # 1. Init Git
-            run_command("git init", cwd=temp_dir)
-            run_command("git checkout -b main", cwd=temp_dir)
+            run_command("git init --initial-branch=main", cwd=temp_dir) # git >= 2.28; one spawn instead of init + checkout -b
 
             # 2. Add random files
             with open(os.path.join(temp_dir, "file1.py"), "w") as f:
                 f.write(f"# Python test file {random.randint(1, 1000)}\nprint('Hello Radicle!')")
             with open(os.path.join(temp_dir, "README.md"), "w") as f:
-                f.write(f"# Test Repo\nRandom content: {uuid.uuid4()}")
-            run_command("git add .", cwd=temp_dir)
+                f.write(f"# Test Repo\nRandom content: {self._unique_token()} {time.time()}")
+            run_command("git add file1.py README.md", cwd=temp_dir)
             commit_msg = f"Initial commit {time.time()}"
             git_commit_success, _, _ = run_command(f"git commit -m '{commit_msg}'", cwd=temp_dir)
             if not git_commit_success:
@@ -171,34 +261,14 @@ class Validator:
                 bt.logging.error("Failed to get commit hash.")
                 return None, None, "Failed to get commit hash"
 
-            # 3. Init Radicle repo with passphrase via pexpect
-            try:
-                bt.logging.debug("Running rad init with passphrase via pexpect.")
-                command = f"rad init --name {repo_name} --description 'Test repo for Bittensor validation' --default-branch main --public"
-                child = pexpect.spawn(command, cwd=temp_dir, encoding="utf-8", timeout=70)
-                # Optional logging to stdout
-                # child.logfile = sys.stdout
-                passphrase = "<YOUR_RADICAL_PASSPHRASE>" # Replace with your actual passphrase
-                index = child.expect([
-                    re.compile(r'(?i)passphrase.*:', re.IGNORECASE),
-                    pexpect.EOF,
-                    pexpect.TIMEOUT
-                ])
-                if index == 0:
-                    child.sendline(passphrase)
-                    child.expect(pexpect.EOF)
-                    output = child.before
-                    bt.logging.debug(f"Radicle init output (with passphrase): {output}")
-                elif index == 1:
-                    # No passphrase prompt; likely already unlocked
-                    bt.logging.warning("Passphrase prompt not shown — identity might be already unlocked.")
-                    output = child.before
-                    bt.logging.debug(f"Radicle init output (no passphrase): {output}")
-                else:
-                    raise Exception("Timeout while waiting for rad init to prompt passphrase or complete.")
-            except pexpect.exceptions.ExceptionPexpect as e:
-                bt.logging.error(f"Radicle init via pexpect failed: {str(e)}")
-                return None, None, f"Radicle init failed: {str(e)}"
+            # 3. Init Radicle repo; the identity is unlocked through RAD_PASSPHRASE instead of answering a pty prompt
+            bt.logging.debug("Running rad init with passphrase from the environment.")
+            command = f"rad init --name {repo_name} --description 'Test repo for Bittensor validation' --default-branch main --public"
+            init_success, init_stdout, init_stderr = run_command(command, cwd=temp_dir, env=_RAD_ENV)
+            bt.logging.debug(f"Radicle init output: {init_stdout}")
+            if not init_success:
+                bt.logging.error(f"Radicle init failed: {init_stderr}")
+                return None, None, f"Radicle init failed: {init_stderr}"
 
             # 4. Get RID
             time.sleep(1)
@@ -212,11 +282,10 @@ class Validator:
             bt.logging.info(f"Radicle project pushed successfully: {repo_rid}")
             return repo_rid, commit_hash, None , temp_dir
         except Exception as e:
-            bt.logging.error(f"Error in create_and_push_radicle_repo: {e}\n{traceback.format_exc()}")
+            bt.logging.error(f"Error in create_and_push_radicle_repo: {e}", exc_info=True)
             return None, None, str(e)
         finally:
-            if os.path.exists(temp_dir):
-                shutil.rmtree(temp_dir)
+            shutil.rmtree(temp_dir, ignore_errors=True)
 
     def clone_repository_locally(self, repo_rid: str, miner_node_id: str):
         """
@@ -233,14 +302,15 @@ class Validator:
         
         # Sanitize RID for use in path if needed, or use a UUID for the dir name
         sanitized_rid_for_path = repo_rid.replace(":", "_").replace("/", "_")
-        clone_target_dir = os.path.join(base_clone_dir, f"clone_{sanitized_rid_for_path}_{str(uuid.uuid4())[:8]}")
+        clone_target_dir = os.path.join(base_clone_dir, f"clone_{sanitized_rid_for_path}_{self._unique_token()}")
 
         bt.logging.info(f"Validator attempting to clone RID {repo_rid} into its local directory: {clone_target_dir}")
         try:
             # The command `rad clone <RID> <target_directory> --seed <NODEID>`
             # We add `--no-confirm` to avoid potential prompts if the identity is already seeding it.
+            # The clone signs the local fork under the validator's NID, so it needs RAD_PASSPHRASE from _RAD_ENV.
             # And `--no-seed` because the validator isn't intending to become a long-term seeder from this action, just verify cloneability.
-            clone_success_flag, stdout, stderr = run_command(f"rad clone {repo_rid} {clone_target_dir} --no-confirm --seed {miner_node_id} ")
+            clone_success_flag, stdout, stderr = run_command(f"rad clone {repo_rid} {clone_target_dir} --no-confirm --seed {miner_node_id} ", env=_RAD_ENV)
 
             if clone_success_flag and os.path.exists(os.path.join(clone_target_dir, ".git")):
                 bt.logging.info(f"Validator successfully cloned RID {repo_rid} to {clone_target_dir}.")
@@ -274,18 +344,16 @@ class Validator:
                 readme_path = os.path.join(local_repo_path, "validator_change_file.txt") # Create if README doesn't exist
             
             with open(readme_path, "a") as f: 
-                f.write(f"\nValidator-driven update: {uuid.uuid4()} at {time.time()}")
+                f.write(f"\nValidator-driven update: {self._unique_token()} at {time.time()}")
             bt.logging.info(f"Validator [_modify_local_repo_and_push]: Modified {readme_path}.")
 
             # Step 2: Commit changes (was Step 3)
-            commit_msg = f"Automated validator update {uuid.uuid4()} for {repo_rid_for_logging}"
-            run_command("git add .", cwd=local_repo_path) # Add all changes
+            commit_msg = f"Automated validator update {self._unique_token()} for {repo_rid_for_logging}"
+            run_command(f"git add {shlex.quote(readme_path)}", cwd=local_repo_path) # Only the file written above, no full work-tree scan
             commit_success, stdout_commit, stderr_commit = run_command(f"git commit -m \"{commit_msg}\"", cwd=local_repo_path)
             
             if not commit_success:
-                if "nothing to commit" in stderr_commit.lower() or \
-                   "no changes added to commit" in stderr_commit.lower() or \
-                   "working tree clean" in stderr_commit.lower(): # More checks for no-op commit
+                if _NOTHING_TO_COMMIT_RE.search(stderr_commit): # No-op commit
                     bt.logging.warning(f"Validator [_modify_local_repo_and_push]: No new changes to commit in {local_repo_path}. Will attempt push anyway.")
                     # Still proceed to push, as an empty push might be valid (though unusual here) or Radicle handles it.
                 else:
@@ -294,31 +362,11 @@ class Validator:
 
             # Step 3: Push changes (was Step 4)
             bt.logging.info(f"Validator [_modify_local_repo_and_push]: Pushing changes from {local_repo_path} for {repo_rid_for_logging}.")
-            command = "rad auth"
-            child = pexpect.spawn(command, cwd=local_repo_path, encoding="utf-8", timeout=70)
-            passphrase = "<YOUR_RADICAL_PASSPHRASE>" # Replace with your actual passphrase
-            index = child.expect([
-            re.compile(r'(?i)passphrase.*:', re.IGNORECASE),
-                pexpect.EOF,
-                pexpect.TIMEOUT
-            ])
-            if index == 0:
-                child.sendline(passphrase)
-                child.expect(pexpect.EOF)
-                output = child.before
-                bt.logging.debug(f"Radicle init output (with passphrase): {output}")
-            elif index == 1:
-                # No passphrase prompt; likely already unlocked
-                bt.logging.warning("Passphrase prompt not shown — identity might be already unlocked.")
-                output = child.before
-                bt.logging.debug(f"Radicle init output (no passphrase): {output}")
-            else:
-                raise Exception("Timeout while waiting for rad init to prompt passphrase or complete.")
-
+            # Signing goes through git-remote-rad, which unlocks the identity from RAD_PASSPHRASE in _RAD_ENV
             # `git push rad main` assumes 'rad' remote is set and 'main' is the branch.
             # Radicle also allows `rad push` from within the directory.
             # Using `git push rad main` is more explicit if you want to ensure the `main` branch is pushed.
-            push_success, stdout_push, stderr_push = run_command("git push rad main", cwd=local_repo_path)
+            push_success, stdout_push, stderr_push = run_command("git push rad main", cwd=local_repo_path, env=_RAD_ENV)
             bt.logging.info(f"success {push_success} out {stdout_push} err {stderr_push}")
             if not push_success:
                 bt.logging.error(f"Validator [_modify_local_repo_and_push]: Failed to push changes for {repo_rid_for_logging} from {local_repo_path}. Stdout: {stdout_push}, Stderr: {stderr_push}")
@@ -328,7 +376,7 @@ class Validator:
             return True
 
         except Exception as e:
-            bt.logging.error(f"Validator [_modify_local_repo_and_push]: Exception for {repo_rid_for_logging} in {local_repo_path}: {e}\n{traceback.format_exc()}")
+            bt.logging.error(f"Validator [_modify_local_repo_and_push]: Exception for {repo_rid_for_logging} in {local_repo_path}: {e}", exc_info=True)
             return False
     
     def _create_branch_modify_and_push_from_existing_clone(self, local_repo_path: str, repo_rid_for_logging: str) -> Tuple[bool, Optional[str]]:
@@ -346,7 +394,7 @@ class Validator:
             return False, None
 
         bt.logging.info(f"Validator [_create_branch_...]: Operating on existing clone {local_repo_path} for new branch on RID {repo_rid_for_logging}.")
-        new_branch_name = f"feat/val-branch-{uuid.uuid4().hex[:6]}"
+        new_branch_name = f"feat/val-branch-{self._unique_token()}"
 
         try:
             # Step 1: Create and checkout new branch (was Step 2)
@@ -359,27 +407,25 @@ class Validator:
             # Step 2: Make random changes (was Step 3)
             change_file_path = os.path.join(local_repo_path, f"update_on_branch_{new_branch_name.replace('/', '_')}.txt")
             with open(change_file_path, "a") as f:
-                f.write(f"\nUpdate on branch {new_branch_name}: {uuid.uuid4()} at {time.time()}")
+                f.write(f"\nUpdate on branch {new_branch_name}: {self._unique_token()} at {time.time()}")
             bt.logging.info(f"Validator [_create_branch_...]: Modified {change_file_path} on branch {new_branch_name}.")
 
             # Step 3: Commit changes (was Step 4)
             commit_msg = f"Auto update on new branch {new_branch_name} for {repo_rid_for_logging}"
-            run_command("git add .", cwd=local_repo_path)
+            run_command(f"git add {shlex.quote(change_file_path)}", cwd=local_repo_path)
             commit_success, _, stderr_commit = run_command(f"git commit -m \"{commit_msg}\"", cwd=local_repo_path)
             if not commit_success:
-                if "nothing to commit" in stderr_commit.lower() or "no changes added" in stderr_commit.lower():
+                if _NOTHING_TO_COMMIT_RE.search(stderr_commit):
                     bt.logging.warning(f"Validator [_create_branch_...]: No new changes to commit on branch {new_branch_name} in {local_repo_path}.")
                 else:
                     bt.logging.error(f"Validator [_create_branch_...]: Git commit failed for branch {new_branch_name}. Stderr: {stderr_commit}")
                     return False, new_branch_name # Return branch name even if commit fails, for context
 
             # Step 4: Push the new branch to Radicle (was Step 5)
-            # Assuming Radicle identity is unlocked (pexpect block for 'rad auth' is still in your _modify_local_repo_and_push)
-            # For consistency, it might be good to have a common "ensure_identity_unlocked" helper or add pexpect here.
-            # For now, proceeding without explicit pexpect for `git push` in this specific function, relying on prior unlocking.
+            # The push is signed by git-remote-rad, which unlocks the identity from RAD_PASSPHRASE in _RAD_ENV.
             bt.logging.info(f"Validator [_create_branch_...]: Pushing new branch {new_branch_name} from {local_repo_path} for {repo_rid_for_logging}.")
             push_cmd = f"git push -u rad {new_branch_name}" # -u sets upstream
-            push_success, stdout_push, stderr_push = run_command(push_cmd, cwd=local_repo_path)
+            push_success, stdout_push, stderr_push = run_command(push_cmd, cwd=local_repo_path, env=_RAD_ENV)
             
             if not push_success:
                 bt.logging.error(f"Validator [_create_branch_...]: Failed to push new branch {new_branch_name}. Stdout: {stdout_push}, Stderr: {stderr_push}")
@@ -389,7 +435,7 @@ class Validator:
             return True, new_branch_name
 
         except Exception as e:
-            bt.logging.error(f"Validator [_create_branch_...]: Exception for {repo_rid_for_logging} in {local_repo_path}: {e}\n{traceback.format_exc()}")
+            bt.logging.error(f"Validator [_create_branch_...]: Exception for {repo_rid_for_logging} in {local_repo_path}: {e}", exc_info=True)
             return False, new_branch_name
     
 
@@ -406,7 +452,7 @@ class Validator:
 
         bt.logging.info(f"Validator [_create_issue_locally]: Creating issue in {local_repo_path} for RID {repo_rid_for_logging}.")
 
-        issue_title = f"Automated Test Issue {uuid.uuid4().hex[:8]}"
+        issue_title = f"Automated Test Issue {self._unique_token()}"
         issue_description = f"This is an automated test issue created by the validator for {repo_rid_for_logging} at {time.time()}."
         
         # Escape quotes in title and description for the shell command
@@ -414,13 +460,11 @@ class Validator:
         safe_description = shlex.quote(issue_description)
 
         # The `rad issue open` command creates the issue locally.
-        # It might require the identity to be unlocked if it's the first operation.
-        # For now, assuming identity is unlocked or command runs non-interactively.
-        # If pexpect is needed, this would be more complex.
+        # It signs the issue, so the identity is unlocked from RAD_PASSPHRASE in _RAD_ENV.
         issue_cmd = f"rad issue open --title {safe_title} --description {safe_description} " 
         
         bt.logging.debug(f"Validator [_create_issue_locally]: Running issue command: {issue_cmd} in {local_repo_path}")
-        issue_success, stdout_issue, stderr_issue = run_command(issue_cmd, cwd=local_repo_path)
+        issue_success, stdout_issue, stderr_issue = run_command(issue_cmd, cwd=local_repo_path, env=_RAD_ENV)
 
         if not issue_success:
             bt.logging.error(f"Validator [_create_issue_locally]: Failed to create issue for {repo_rid_for_logging} in {local_repo_path}. Stdout: {stdout_issue}, Stderr: {stderr_issue}")
@@ -428,7 +472,7 @@ class Validator:
         
         # `rad issue open` usually prints the issue ID to stdout, e.g., "✓ Issue #123abc created."
         # We can check for such a message for further confirmation.
-        if "✓ Synced" in stdout_issue and "seed(s)" in stdout_issue:
+        if _SYNCED_MARKER in stdout_issue and _SEEDS_MARKER in stdout_issue:
             bt.logging.info(f"Validator [_create_issue_locally]: Successfully created issue for {repo_rid_for_logging}. Output: {stdout_issue}")
             return True
         else:
@@ -449,7 +493,7 @@ class Validator:
             bt.logging.error(f"Validator [_create_and_push_patch...]: Path {local_repo_path} is not a valid git repository.")
             return False, None
 
-        feature_branch_name = f"patch-feature-{uuid.uuid4().hex[:6]}"
+        feature_branch_name = f"patch-feature-{self._unique_token()}"
         patch_ref_name = feature_branch_name # Using branch name as patch identifier for simplicity
 
         bt.logging.info(f"Validator [_create_and_push_patch...]: Creating patch '{patch_ref_name}' for RID {repo_rid_for_logging} using local clone {local_repo_path}.")
@@ -457,7 +501,7 @@ class Validator:
         try:
             # Step 1: Create and checkout new feature branch
             run_command(f"git checkout main", cwd=local_repo_path) # Ensure starting from main
-            run_command(f"git pull rad main", cwd=local_repo_path) # Ensure main is up-to-date
+            run_command(f"git pull rad main", cwd=local_repo_path, env=_RAD_ENV) # Ensure main is up-to-date
             checkout_success, _, stderr_checkout = run_command(f"git checkout -b {feature_branch_name}", cwd=local_repo_path)
             if not checkout_success:
                 bt.logging.error(f"Validator [_create_and_push_patch...]: Failed to create/checkout feature branch {feature_branch_name}. Stderr: {stderr_checkout}")
@@ -467,39 +511,31 @@ class Validator:
             # Step 2: Make changes and commit
             patch_file_path = os.path.join(local_repo_path, f"patch_contribution_{feature_branch_name.replace('/', '_')}.md")
             with open(patch_file_path, "w") as f:
-                f.write(f"# Contribution for Patch {patch_ref_name}\n\nThis is an automated patch generated by validator for {repo_rid_for_logging} at {time.time()}.\nUUID: {uuid.uuid4()}")
+                f.write(f"# Contribution for Patch {patch_ref_name}\n\nThis is an automated patch generated by validator for {repo_rid_for_logging} at {time.time()}.\nToken: {self._unique_token()}")
             bt.logging.info(f"Validator [_create_and_push_patch...]: Created/modified {patch_file_path}.")
 
-            run_command("git add .", cwd=local_repo_path)
+            run_command(f"git add {shlex.quote(patch_file_path)}", cwd=local_repo_path)
             commit_msg = f"Add feature for patch {patch_ref_name}"
             commit_success, _, stderr_commit = run_command(f"git commit -m \"{commit_msg}\"", cwd=local_repo_path)
             if not commit_success:
                 # Handle "nothing to commit" if changes were somehow not detected
-                if "nothing to commit" in stderr_commit.lower() or "no changes added" in stderr_commit.lower():
+                if _NOTHING_TO_COMMIT_RE.search(stderr_commit):
                     bt.logging.warning(f"Validator [_create_and_push_patch...]: No new changes detected for commit on branch {feature_branch_name}.")
                 else:
                     bt.logging.error(f"Validator [_create_and_push_patch...]: Git commit failed for patch branch. Stderr: {stderr_commit}")
                     return False, None
             
-            # Step 3: Push the feature branch to Radicle
-            bt.logging.info(f"Validator [_create_and_push_patch...]: Pushing feature branch {feature_branch_name}...")
-            # Ensure Radicle identity is unlocked if pexpect not used here
-            push_branch_success, stdout_pb, stderr_pb = run_command(f"git push -u rad {feature_branch_name}", cwd=local_repo_path)
-            if not push_branch_success:
-                bt.logging.error(f"Validator [_create_and_push_patch...]: Failed to push feature branch {feature_branch_name}. Stdout: {stdout_pb}, Stderr: {stderr_pb}")
-                return False, None
-            bt.logging.info(f"Validator [_create_and_push_patch...]: Feature branch {feature_branch_name} pushed successfully.")
-
-            # Step 4: Publish the patch
+            # Step 3: Push the feature branch and publish the patch in one push
             # git push rad <local-branch>:<patch-ref-for-remote>
             # The patch ref is typically refs/patches/<some-identifier>
-            # Using the feature branch name as the patch identifier part for simplicity
-            patch_push_cmd = f"git push rad {feature_branch_name}:refs/patches/{patch_ref_name}"
-            bt.logging.info(f"Validator [_create_and_push_patch...]: Publishing patch with command: {patch_push_cmd}")
-            push_patch_success, stdout_patch, stderr_patch = run_command(patch_push_cmd, cwd=local_repo_path)
+            # Using the feature branch name as the patch identifier part for simplicity.
+            # Both refspecs go through a single git/remote-helper invocation instead of two.
+            patch_push_cmd = f"git push -u rad {feature_branch_name} {feature_branch_name}:refs/patches/{patch_ref_name}"
+            bt.logging.info(f"Validator [_create_and_push_patch...]: Pushing feature branch {feature_branch_name} and publishing patch with command: {patch_push_cmd}")
+            push_patch_success, stdout_patch, stderr_patch = run_command(patch_push_cmd, cwd=local_repo_path, env=_RAD_ENV)
             
             if not push_patch_success:
-                bt.logging.error(f"Validator [_create_and_push_patch...]: Failed to publish patch {patch_ref_name}. Stdout: {stdout_patch}, Stderr: {stderr_patch}")
+                bt.logging.error(f"Validator [_create_and_push_patch...]: Failed to push feature branch {feature_branch_name} / publish patch {patch_ref_name}. Stdout: {stdout_patch}, Stderr: {stderr_patch}")
                 return False, None
             
             bt.logging.info(f"Validator [_create_and_push_patch...]: Successfully published patch {patch_ref_name}. Output: {stdout_patch}")
@@ -508,7 +544,7 @@ class Validator:
             return True, patch_ref_name
 
         except Exception as e:
-            bt.logging.error(f"Validator [_create_and_push_patch...]: Exception for {repo_rid_for_logging}: {e}\n{traceback.format_exc()}")
+            bt.logging.error(f"Validator [_create_and_push_patch...]: Exception for {repo_rid_for_logging}: {e}", exc_info=True)
             # Attempt to switch back to main on error to leave repo in a known state
             try: run_command(f"git checkout main", cwd=local_repo_path)
             except: pass
@@ -526,7 +562,7 @@ class Validator:
 
         # Step 1: Send UNSEED_REPO request
         unseed_synapse = RadicleSubnetSynapse(
-            operation_type="UNSEED_REPO",
+            operation_type=RadicleOperation.UNSEED_REPO.value,
             repo_rid=repo_rid
         )
         
@@ -553,14 +589,15 @@ class Validator:
         base_reclone_dir = "/tmp/validator_post_unseed_clones"
         os.makedirs(base_reclone_dir, exist_ok=True)
         sanitized_rid_for_path = repo_rid.replace(":", "_").replace("/", "_")
-        reclone_target_dir = os.path.join(base_reclone_dir, f"post_unseed_{sanitized_rid_for_path}_{str(uuid.uuid4())[:8]}")
+        reclone_target_dir = os.path.join(base_reclone_dir, f"post_unseed_{sanitized_rid_for_path}_{self._unique_token()}")
 
         reclone_actually_failed = False
         try:
             # Important: clone from the specific miner's node_id
             clone_command = f"rad clone {repo_rid} {reclone_target_dir} --seed {target_miner_node_id} --no-confirm"
             bt.logging.debug(f"Validator [test_unseeding]: Running re-clone command: {clone_command}")
-            reclone_cmd_success, stdout, stderr = run_command(clone_command)
+            async with self._clone_lock(repo_rid): # Shares the validator's Radicle storage with the other re-clones
+                reclone_cmd_success, stdout, stderr = await run_command_async(clone_command, env=_RAD_ENV)
 
             if reclone_cmd_success and os.path.exists(os.path.join(reclone_target_dir, ".git")):
                 bt.logging.warning(f"Validator [test_unseeding]: Re-clone of {repo_rid} from UID {target_miner_uid} (Node: {target_miner_node_id}) SUCCEEDED after unseed. Unseeding test FAILED for this miner.")
@@ -572,14 +609,35 @@ class Validator:
             bt.logging.error(f"Validator [test_unseeding]: Exception during re-clone attempt for {repo_rid} from UID {target_miner_uid}: {e}")
             reclone_actually_failed = True # If clone itself errors, treat as data not easily available
         finally:
-            if os.path.exists(reclone_target_dir):
-                try:
-                    shutil.rmtree(reclone_target_dir)
-                except Exception as e:
-                    bt.logging.error(f"Validator [test_unseeding]: Error removing re-clone temp dir {reclone_target_dir}: {e}")
+            await asyncio.to_thread(shutil.rmtree, reclone_target_dir, ignore_errors=True)
         
         return reclone_actually_failed # True if re-clone failed (unseed successful)
 
+    def update_scores_for_uids(self, uids_to_update: List[int], round_scores: torch.Tensor):
+        """
+        Blends this round's scores into the moving average for the queried UIDs only.
+        UIDs that were not queried keep their previous moving average untouched.
+        """
+        if not uids_to_update:
+            return
+        idx = torch.as_tensor(uids_to_update, dtype=torch.long)
+        old_scores = self.moving_avg_scores.index_select(0, idx)
+        new_scores = round_scores.index_select(0, idx)
+        self.moving_avg_scores.index_copy_(0, idx, (1 - self.alpha) * old_scores + self.alpha * new_scores)
+
+    def _remap_scores_by_hotkey(self, scores: torch.Tensor, previous_uid_by_hotkey: Dict[str, int], current_hotkeys: Tuple[str, ...]) -> torch.Tensor:
+        """
+        Returns a tensor sized for current_hotkeys where each hotkey that was already present keeps its old score.
+        New or replaced hotkeys start from 0.
+        """
+        remapped = torch.zeros(len(current_hotkeys), dtype=torch.float32)
+        kept = [(new_uid, previous_uid_by_hotkey[hotkey]) for new_uid, hotkey in enumerate(current_hotkeys)
+                if hotkey in previous_uid_by_hotkey and previous_uid_by_hotkey[hotkey] < scores.size(0)]
+        if kept:
+            new_uids, old_uids = zip(*kept)
+            remapped[list(new_uids)] = scores[list(old_uids)]
+        return remapped
+
     async def run_sync_loop(self):
         """The main validation loop."""
         bt.logging.info("Starting validator sync loop.")
@@ -599,21 +657,23 @@ class Validator:
                 bt.logging.info(f"Validator: Successfully created and pushed test repo. RID: {repo_to_validate_rid}, Commit: {commit_hash}")
 
                 # --- Step 2: Identify available miners ---
-                available_uids = [uid for uid in self.metagraph.uids.tolist() if self.metagraph.axons[uid].is_serving]
+                available_uids = self._serving_uids
                 if not available_uids:
                     bt.logging.warning("Validator: No active miners found to query.")
                     self.metagraph.sync(subtensor=self.subtensor)
+                    self._cache_sync_state()
                     await asyncio.sleep(60) # Wait longer if no miners
                     continue
                 
                 bt.logging.info(f"Validator: Found {len(available_uids)} active miners to query: {available_uids}")
                 
-                current_round_scores = torch.zeros_like(self.scores) # Scores for this specific round
+                # Scores for this specific round, accumulated as plain floats and turned into a tensor once in Stage 7
+                current_round_scores = [0.0] * self.n
                 miner_round_data = {} # Track detailed info for each miner
 
                 # === Stage 3: Get Miner Status ===
                 miner_status_synapse = RadicleSubnetSynapse(
-                    operation_type="GET_MINER_STATUS"
+                    operation_type=RadicleOperation.GET_MINER_STATUS.value
                 )
                 bt.logging.info(f"Validator: Stage 3 - Querying {len(available_uids)} miners for MINER_STATUS...")
 
@@ -646,7 +706,7 @@ class Validator:
 
                 # === Stage 4: Query miners to explicitly VALIDATE THE PUSH (Miner confirms seeding) ===
                 validate_push_synapse = RadicleSubnetSynapse(
-                    operation_type="VALIDATE_PUSH",
+                    operation_type=RadicleOperation.VALIDATE_PUSH.value,
                     repo_rid=repo_to_validate_rid,
                     commit_hash=commit_hash
                 )
@@ -677,12 +737,18 @@ class Validator:
                 test_dir_path = ""
                 # === Stage 5: Initial Clone Test by Validator ===
                 bt.logging.info(f"Validator: Stage 5 - Testing initial clone of {repo_to_validate_rid} from miners with node_id...")
+                # Clones of the same RID share the validator's Radicle storage, so they run one at a time (see _clone_lock)
+                clone_uids = [uid for uid in uids_for_targeted_tests if miner_round_data[uid].get('status_success', False)]
+                for uid in clone_uids:
+                    bt.logging.info(f"Validator: UID {uid} has node_id {miner_round_data[uid]['node_id']}. Attempting initial clone.")
+                clone_results = await asyncio.gather(*(
+                    self.clone_repository_serialized(repo_to_validate_rid, miner_round_data[uid]['node_id'])
+                    for uid in clone_uids
+                ))
+                clone_result_by_uid = dict(zip(clone_uids, clone_results))
                 for uid in uids_for_targeted_tests:
-                    if miner_round_data[uid].get('status_success', False):
-                        miner_node_id = miner_round_data[uid]['node_id']
-                        bt.logging.info(f"Validator: UID {uid} has node_id {miner_node_id}. Attempting initial clone.")
-                        
-                        initial_clone_successful = self.clone_repository_locally(repo_to_validate_rid, miner_node_id)
+                    if uid in clone_result_by_uid:
+                        initial_clone_successful = clone_result_by_uid[uid]
                         miner_round_data[uid]['initial_clone_success'] = initial_clone_successful['status']
                         test_dir_path = initial_clone_successful['dir']
                         if initial_clone_successful:
@@ -711,7 +777,7 @@ class Validator:
                         if miner_round_data[uid].get('initial_clone_success', False): 
                             bt.logging.info(f"Validator: Asking UID {uid} to sync changes for {repo_to_validate_rid}.")
                             sync_changes_synapse = RadicleSubnetSynapse(
-                                operation_type="VALIDATE_CHANGES_SYNC",
+                                operation_type=RadicleOperation.VALIDATE_CHANGES_SYNC.value,
                                 repo_sync_rid=repo_to_validate_rid,
                                 
                             )
@@ -729,13 +795,13 @@ class Validator:
                                sync_changes_responses[0].changes_synced_successfully:
                                 current_round_scores[uid] += 0.1 # Score for successful sync by miner (0.2)
                                 miner_round_data[uid]['changes_synced_success_by_miner'] = True
-                                bt.logging.info(f"UID {uid}: Miner successfully synced changes for {repo_to_validate_rid}. Score +0.2. Total score for UID: {current_round_scores[uid].item()}")
+                                bt.logging.info(f"UID {uid}: Miner successfully synced changes for {repo_to_validate_rid}. Score +0.2. Total score for UID: {current_round_scores[uid]}")
                             else:
                                 miner_round_data[uid]['changes_synced_success_by_miner'] = False
                                 error_msg_sync = (sync_changes_responses[0].error_message 
                                                   if sync_changes_responses and sync_changes_responses[0].error_message 
                                                   else "Miner sync failed or reported failure.")
-                                bt.logging.warning(f"UID {uid}: Miner FAILED to sync changes for {repo_to_validate_rid}. Error: {error_msg_sync}. Total score for UID: {current_round_scores[uid].item()}")
+                                bt.logging.warning(f"UID {uid}: Miner FAILED to sync changes for {repo_to_validate_rid}. Error: {error_msg_sync}. Total score for UID: {current_round_scores[uid]}")
                         else:
                             bt.logging.debug(f"UID {uid}: Skipping changes sync test as initial clone or prerequisite step was not successful.")
                 else:
@@ -754,7 +820,7 @@ class Validator:
                             for uid in uids_for_targeted_tests:
                                 if miner_round_data[uid].get('validated_push_success', False): 
                                     sync_branch_synapse = RadicleSubnetSynapse(
-                                        operation_type="VALIDATE_BRANCH_SYNC",
+                                        operation_type=RadicleOperation.VALIDATE_BRANCH_SYNC.value,
                                         branch_sync_repo_id=repo_to_validate_rid 
                                     )
                                     target_axon_branch_sync = self.metagraph.axons[uid]
@@ -783,7 +849,7 @@ class Validator:
                             for uid in uids_for_targeted_tests:
                                 if miner_round_data[uid].get('validate_push_success', False): # Prerequisite: miner is generally responsive and seeding
                                     sync_issue_synapse = RadicleSubnetSynapse(
-                                        operation_type="VALIDATE_ISSUE_SYNC",
+                                        operation_type=RadicleOperation.VALIDATE_ISSUE_SYNC.value,
                                         issue_sync_repo_id=repo_to_validate_rid # Send the RID of the project where issue was made
                                     )
                                     target_axon_issue_sync = self.metagraph.axons[uid]
@@ -816,7 +882,7 @@ class Validator:
                             for uid in uids_for_targeted_tests:
                                 if miner_round_data[uid]:
                                     sync_patch_synapse = RadicleSubnetSynapse(
-                                        operation_type="VALIDATE_PATCH_SYNC",
+                                        operation_type=RadicleOperation.VALIDATE_PATCH_SYNC.value,
                                         patch_sync_repo_id=repo_to_validate_rid # Send the project RID
                                         # Optionally, could send pushed_patch_ref_name if miner were to verify specific patch
                                     )
@@ -845,16 +911,23 @@ class Validator:
 
                 # === Stage 6: Test Repository Unseeding by Miners ===
                 bt.logging.info(f"Validator: Stage 6 - Testing UNSEED_REPO for {repo_to_validate_rid} with miners that allowed initial clone...")
+                # Only test unseeding if initial clone from them was possible; the unseed requests run concurrently,
+                # the verification re-clones take the per-RID clone lock
+                unseed_uids = [uid for uid in uids_for_targeted_tests if miner_round_data[uid].get('initial_clone_success', False)]
+                for uid in unseed_uids:
+                    bt.logging.info(f"Validator: UID {uid} allowed initial clone. Proceeding to test UNSEED_REPO.")
+                unseed_results = await asyncio.gather(*(
+                    self.test_repository_unseeding(
+                        repo_rid=repo_to_validate_rid,
+                        target_miner_uid=uid,
+                        target_miner_node_id=miner_round_data[uid]['node_id']
+                    )
+                    for uid in unseed_uids
+                ))
+                unseed_result_by_uid = dict(zip(unseed_uids, unseed_results))
                 for uid in uids_for_targeted_tests: # Iterate through miners who had a node_id
-                    if miner_round_data[uid].get('initial_clone_success', False): # Only test unseeding if initial clone from them was possible
-                        miner_node_id_for_unseed_test = miner_round_data[uid]['node_id']
-                        bt.logging.info(f"Validator: UID {uid} allowed initial clone. Proceeding to test UNSEED_REPO.")
-
-                        unseeding_test_passed = await self.test_repository_unseeding(
-                            repo_rid=repo_to_validate_rid,
-                            target_miner_uid=uid,
-                            target_miner_node_id=miner_node_id_for_unseed_test
-                        )
+                    if uid in unseed_result_by_uid:
+                        unseeding_test_passed = unseed_result_by_uid[uid]
                         miner_round_data[uid]['unseeding_test_passed'] = unseeding_test_passed
                         if unseeding_test_passed:
                             # Unseeding test passed means re-clone FAILED, which is good.
@@ -866,36 +939,29 @@ class Validator:
                         bt.logging.debug(f"UID {uid}: Skipping UNSEED_REPO test as initial clone was not successful or no node_id.")
 
                 # --- Stage 7: Update moving average scores ---
-                for uid_idx in range(self.metagraph.n.item()):
-                    if uid_idx in available_uids: 
-                        self.moving_avg_scores[uid_idx] = (
-                            (1 - self.alpha) * self.moving_avg_scores[uid_idx] +
-                            self.alpha * current_round_scores[uid_idx] 
-                        )
+                self.update_scores_for_uids(available_uids, torch.tensor(current_round_scores, dtype=torch.float32))
                 
-                bt.logging.info(f"Validator: Moving Average Scores: {['{:.3f}'.format(s.item()) for s in self.moving_avg_scores]}" )
+                bt.logging.info(f"Validator: Moving Average Scores: {['{:.3f}'.format(s) for s in self.moving_avg_scores.tolist()]}" )
 
                 # --- Step 8: Set weights on Bittensor network ---
             
                 current_block = self.subtensor.get_current_block()
-                try:
-                    last_set_weights_block = self.metagraph.last_update[self.my_subnet_uid].item()
-                except Exception as e:
-                    bt.logging.warning(f"Could not get last_set_weights_block for validator UID {self.my_subnet_uid}, defaulting to 0. Error: {e}")
-                    last_set_weights_block = 0
-                
-                tempo = self.subtensor.tempo(self.config.netuid)
+                last_set_weights_block = self._last_update_self # Read from the metagraph once per sync
+                tempo = self.tempo # Refreshed with the metagraph, saves one RPC per round
 
                 if (current_block - last_set_weights_block) > tempo :
-                    if torch.sum(self.moving_avg_scores) > 1e-6: # Check for sum being practically non-zero
-                        weights_to_set = self.moving_avg_scores / torch.sum(self.moving_avg_scores)
-                        weights_to_set = torch.nan_to_num(weights_to_set, nan=0.0) # Handle potential NaNs
+                    # Clear NaNs in place so one bad score cannot poison later rounds, then normalise with
+                    # a single reduction; scores are non-negative so no abs() pass is needed.
+                    self.moving_avg_scores.nan_to_num_(nan=0.0)
+                    total_score = float(self.moving_avg_scores.sum())
+                    if total_score > 1e-6: # Check for sum being practically non-zero
+                        weights_to_set = self.moving_avg_scores / total_score
                     else: 
                         weights_to_set = torch.zeros_like(self.moving_avg_scores)
                     
                     uids_for_weights = self.metagraph.uids 
 
-                    bt.logging.info(f"Validator: Attempting to set weights: {['{:.3f}'.format(w.item()) for w in weights_to_set]} for UIDs: {uids_for_weights.tolist()}")
+                    bt.logging.info(f"Validator: Attempting to set weights: {['{:.3f}'.format(w) for w in weights_to_set.tolist()]} for UIDs: {uids_for_weights.tolist()}")
                     
                     success, message = self.subtensor.set_weights(
                         netuid=self.config.netuid,
@@ -907,6 +973,7 @@ class Validator:
                         )
                     if success:
                         bt.logging.info(f"Validator: Successfully set weights: {message}")
+                        self._last_update_self = current_block # The metagraph only reflects this after the next sync
                     else:
                         bt.logging.error(f"Validator: Failed to set weights: {message}")
                 else:
@@ -917,12 +984,23 @@ class Validator:
                 if self.steps_passed % 5 == 0: # Sync metagraph every 5 validation cycles
                     bt.logging.info("Validator: Syncing metagraph.")
                     self.metagraph.sync(subtensor=self.subtensor)
-                    # Resize scores if metagraph size changed
-                    if self.scores.size(0) != self.metagraph.n.item():
-                        bt.logging.info("Validator: Metagraph size changed. Reinitializing scores and moving averages.")
-                        self.scores = torch.zeros(self.metagraph.n.item(), dtype=torch.float32)
-                        self.moving_avg_scores = torch.zeros(self.metagraph.n.item(), dtype=torch.float32)
+                    # Reset scores if the metagraph changed size or any UID was taken over by a new hotkey
+                    current_hotkeys = tuple(self.metagraph.hotkeys)
+                    if current_hotkeys != self.hotkeys:
+                        if self.config.validator.preserve_scores_on_resync:
+                            bt.logging.info("Validator: Metagraph hotkeys changed. Carrying scores over by hotkey.")
+                            self.scores = self._remap_scores_by_hotkey(self.scores, self._hotkey_to_uid, current_hotkeys)
+                            self.moving_avg_scores = self._remap_scores_by_hotkey(self.moving_avg_scores, self._hotkey_to_uid, current_hotkeys)
+                        else:
+                            bt.logging.info("Validator: Metagraph hotkeys changed. Reinitializing scores and moving averages.")
+                            self.scores = torch.zeros(len(current_hotkeys), dtype=torch.float32)
+                            self.moving_avg_scores = torch.zeros(len(current_hotkeys), dtype=torch.float32)
+                        self.hotkeys = current_hotkeys
+                        self.n = len(current_hotkeys)
+                        self._rebuild_hotkey_index()
+                        self.my_subnet_uid = self._hotkey_to_uid.get(self.wallet.hotkey.ss58_address, self.my_subnet_uid)
                         # Also re-check available_uids as metagraph changed
+                    self._cache_sync_state()
                 
                 # Wait for a period before next validation cycle
                 # Consider chain tempo or a fixed delay
@@ -941,7 +1019,7 @@ class Validator:
                 await asyncio.sleep(60)
 
     def run(self):
-        import asyncio
+        # One event loop for the validator's whole lifetime; run_sync_loop never returns to re-enter it
         asyncio.run(self.run_sync_loop())
 
 if __name__ == "__main__":